@@ -5,33 +5,159 @@ A Linux application to download transcripts from YouTube channels or playlists u
 """
 
 import asyncio
+import hashlib
+import heapq
 import json
+import multiprocessing
 import os
+import queue
 import re
+import shutil
+import subprocess
 from pathlib import Path
 from datetime import datetime
-from playwright.async_api import async_playwright
+from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
 import tkinter as tk
 from tkinter import ttk, scrolledtext, filedialog, messagebox
 import threading
+from concurrent.futures import ProcessPoolExecutor
+import weakref
+from collections import deque
+from contextlib import asynccontextmanager
 
 # --- SET CONCURRENCY LIMIT ---
 # Number of videos to download at the same time.
 # 5 is a safe default. Increase (e.g., 10) for more speed, but risk errors.
 CONCURRENT_DOWNLOADS = 5
 
+# --- SET PROCESS LIMIT ---
+# Number of worker processes, each with its own browser downloading
+# CONCURRENT_DOWNLOADS videos at a time. 1 keeps everything in one process.
+# Raise it (up to your CPU count) if Python itself becomes the bottleneck
+# at high concurrency; every process costs a full browser's memory.
+CONCURRENT_PROCESSES = 1
+
+# Close and reopen a pooled page after this many videos.
+# Long-lived pages slowly build up cached responses otherwise.
+PAGE_RECYCLE_AFTER = 25
+
+# Close and replace a pooled browser context after this many videos.
+# This bounds the browser's memory on runs of thousands of videos.
+CONTEXT_RECYCLE_AFTER = 200
+
+# The progress log is refreshed every LOG_DRAIN_INTERVAL_MS with at most
+# LOG_DRAIN_BATCH_SIZE queued lines, instead of one Tk callback per line.
+LOG_DRAIN_INTERVAL_MS = 100
+LOG_DRAIN_BATCH_SIZE = 500
+
+# "Merge All" skips transcripts whose fingerprints differ from an
+# already-merged one in at most this many of 64 bits (reruns, mirrors).
+NEAR_DUPLICATE_BITS = 3
+
+# Resource types a transcript page never needs. Aborting them skips the
+# video player, thumbnails and ads, which makes page loads much lighter.
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font", "stylesheet"}
+
+# Characters stripped from video titles to make safe filenames
+UNSAFE_FILENAME_RE = re.compile(r'[^\w\s-]')
+
+# A sentence ends at the first '.', '!' or '?' once it is over 20 characters long
+SENTENCE_RE = re.compile(r'.{20,}?[.!?]', re.S)
+
+async def block_heavy_resources(route):
+    """Route handler that aborts requests for BLOCKED_RESOURCE_TYPES"""
+    if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+class ContextPool:
+    """Reusable browser contexts, each lent to one user at a time"""
+    def __init__(self, browser, recycle_after=CONTEXT_RECYCLE_AFTER, **context_options):
+        self.browser = browser
+        self.recycle_after = recycle_after
+        self.context_options = context_options
+        self._idle = deque()
+        self._uses = {}
+        self._lock = asyncio.Lock()
+    
+    async def acquire(self):
+        """Take an idle context, creating one if none is free"""
+        # Creation is serialized so concurrent callers never race to build contexts
+        async with self._lock:
+            if self._idle:
+                return self._idle.popleft()
+            context = await self.browser.new_context(**self.context_options)
+            self._uses[context] = 0
+            return context
+    
+    async def release(self, context):
+        """Return a context with its cookies cleared, or close it once worn out"""
+        self._uses[context] += 1
+        if self._uses[context] >= self.recycle_after:
+            del self._uses[context]
+            await context.close()
+            return
+        
+        try:
+            await context.clear_cookies()
+            self._idle.append(context)
+        except Exception:
+            del self._uses[context] # Context died, the next acquire() builds a new one
+
+class PagePool:
+    """Bounds concurrency and reuses one long-lived page per pooled context"""
+    def __init__(self, context_pool, max_size, recycle_after=PAGE_RECYCLE_AFTER):
+        self.context_pool = context_pool
+        self.recycle_after = recycle_after
+        self._slots = asyncio.Semaphore(max_size)
+        self._page_uses = weakref.WeakKeyDictionary()
+    
+    @asynccontextmanager
+    async def acquire(self):
+        """Borrow a page, waiting for a free slot if all are in use"""
+        async with self._slots:
+            context = await self.context_pool.acquire()
+            try:
+                page = context.pages[0] if context.pages else await self._new_page(context)
+                try:
+                    yield page
+                finally:
+                    await self._release(page)
+            finally:
+                await self.context_pool.release(context)
+    
+    async def _release(self, page):
+        """Reset a page for the next video, closing it if it is worn out or broken"""
+        uses = self._page_uses.get(page, 0) + 1
+        if uses < self.recycle_after:
+            try:
+                await page.goto("about:blank")
+                self._page_uses[page] = uses
+                return
+            except Exception:
+                pass # Page crashed, close it below
+        
+        # The context's next borrower opens a fresh page
+        self._page_uses.pop(page, None)
+        try:
+            await page.close()
+        except Exception:
+            pass
+    
+    async def _new_page(self, context):
+        page = await context.new_page()
+        await page.route("**/*", block_heavy_resources)
+        return page
+
 class YouTubeTranscriptExtractor:
     def __init__(self):
         self.output_dir = Path.home() / "youtube_transcripts"
         self.output_dir.mkdir(exist_ok=True)
         self.debug_mode = True
         
-    async def extract_video_urls(self, url, browser, progress_callback):
+    async def extract_video_urls(self, url, context, progress_callback):
         """Extract all video URLs from a channel or playlist"""
-        context = await browser.new_context(
-            viewport={'width': 1920, 'height': 1080},
-            user_agent='Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        )
         page = await context.new_page()
         
         try:
@@ -43,7 +169,12 @@ class YouTubeTranscriptExtractor:
             
             progress_callback(f"Loading URL: {url}")
             await page.goto(url, wait_until="domcontentloaded", timeout=60000)
-            await asyncio.sleep(5)
+            try:
+                await page.wait_for_selector(
+                    'ytd-rich-grid-renderer, ytd-playlist-video-list-renderer', timeout=10000
+                )
+            except PlaywrightTimeoutError:
+                progress_callback("Video list not detected yet, continuing anyway...")
             
             # Accept cookies if popup appears
             try:
@@ -60,94 +191,216 @@ class YouTubeTranscriptExtractor:
             except:
                 pass 
             
-            progress_callback("Scrolling to load all videos (this may take a while)...")
-            
-            # --- START: IMPROVED SCROLLING LOGIC ---
-            previous_height = -1
-            patience = 0
-            max_patience = 5 # Stop after 5 consecutive scrolls with no new content
-            scroll_attempts = 0
-            
-            while patience < max_patience:
-                await page.evaluate("window.scrollTo(0, document.documentElement.scrollHeight)")
-                await asyncio.sleep(2.5) # Give time for content to load
-                
-                current_height = await page.evaluate("document.documentElement.scrollHeight")
-                
-                if current_height == previous_height:
-                    patience += 1
-                    progress_callback(f"Scroll {scroll_attempts}: No new content... (Patience {patience}/{max_patience})")
-                else:
-                    patience = 0 # Reset patience
-                    previous_height = current_height
-                    progress_callback(f"Scroll {scroll_attempts}: Loaded new videos. (Height: {current_height})")
-                
-                scroll_attempts += 1
-                
-                if scroll_attempts > 200: # Safety break for massive channels
-                    progress_callback("Reached 200 scroll attempts, stopping.")
-                    break
-            
-            progress_callback(f"Scrolling complete after {scroll_attempts} attempts.")
-            # --- END: IMPROVED SCROLLING LOGIC ---
-            
-            await asyncio.sleep(3)
-            
-            progress_callback("Extracting video links...")
-            
-            video_links = await page.evaluate("""
-                () => {
-                    const links = [];
-                    const selectors = [
-                        'a#video-title', 'a#video-title-link',
-                        'a.yt-simple-endpoint.style-scope.ytd-video-renderer',
-                        'ytd-video-renderer a#video-title',
-                        'ytd-grid-video-renderer a#video-title',
-                        'ytd-playlist-video-renderer a#video-title'
-                    ];
-                    
-                    for (const selector of selectors) {
-                        const elements = document.querySelectorAll(selector);
-                        for (const el of elements) {
-                            if (el.href && el.href.includes('watch?v=')) {
-                                links.push({
-                                    url: el.href.split('&')[0],
-                                    title: el.title || el.textContent.trim()
-                                });
-                            }
-                        }
-                        if (links.length > 0) break;
-                    }
-                    return links;
-                }
-            """)
-            
-            # Remove duplicates
-            seen = set()
-            unique_videos = []
-            for video in video_links:
-                if video['url'] not in seen and video['title']:
-                    seen.add(video['url'])
-                    unique_videos.append(video)
+            video_links = await self.fetch_links_from_initial_data(page, progress_callback)
+            if not video_links:
+                progress_callback("Video list data not available, falling back to scrolling...")
+                video_links = await self.scroll_and_extract_links(page, progress_callback)
             
-            progress_callback(f"Found {len(unique_videos)} unique videos")
+            progress_callback(f"Found {len(video_links)} unique videos")
             
-            return unique_videos
+            return video_links
             
         except Exception as e:
             progress_callback(f"Error extracting videos: {str(e)}")
             return []
         finally:
-            await context.close()
+            await page.close()
     
-    async def get_transcript(self, video_url, video_title, browser, progress_callback):
-        """Get transcript for a single video"""
-        context = await browser.new_context(
-            viewport={'width': 1920, 'height': 1080},
-            user_agent='Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
-        )
-        page = await context.new_page()
+    def add_unique_video(self, videos, seen, video_id, title):
+        """Append a video unless its ID was already collected or it has no title"""
+        if video_id and title and video_id not in seen:
+            seen.add(video_id)
+            videos.append({'url': f"https://www.youtube.com/watch?v={video_id}", 'title': title})
+    
+    def collect_initial_data_videos(self, node, videos, seen, tokens, in_continuation=False):
+        """Walk YouTube's page/continuation JSON collecting videos and continuation tokens"""
+        if isinstance(node, list):
+            for item in node:
+                self.collect_initial_data_videos(item, videos, seen, tokens, in_continuation)
+            return
+        if not isinstance(node, dict):
+            return
+        
+        for key, value in node.items():
+            if not isinstance(value, (dict, list)):
+                continue
+            if key in ('videoRenderer', 'gridVideoRenderer', 'playlistVideoRenderer') and value.get('videoId'):
+                title = value.get('title', {})
+                self.add_unique_video(
+                    videos, seen, value['videoId'],
+                    title.get('simpleText') or "".join(run.get('text', '') for run in title.get('runs', []))
+                )
+            elif key == 'lockupViewModel' and value.get('contentType') == 'LOCKUP_CONTENT_TYPE_VIDEO':
+                metadata = value.get('metadata', {}).get('lockupMetadataViewModel', {})
+                self.add_unique_video(
+                    videos, seen, value.get('contentId'), metadata.get('title', {}).get('content', '')
+                )
+            elif key == 'continuationCommand' and in_continuation and value.get('token'):
+                # Only follow the "load more" item, not e.g. the sort chips
+                tokens.append(value['token'])
+            else:
+                self.collect_initial_data_videos(
+                    value, videos, seen, tokens, in_continuation or key == 'continuationItemRenderer'
+                )
+    
+    async def fetch_links_from_initial_data(self, page, progress_callback, max_requests=1000):
+        """
+        Read the video list from ytInitialData and follow its continuation
+        tokens through the browse API, making at most max_requests calls.
+        Returns [] if the data is not available; a failed continuation keeps
+        the videos collected so far.
+        """
+        try:
+            page_data = await page.evaluate("""
+                () => ({
+                    initialData: window.ytInitialData || null,
+                    context: window.ytcfg ? ytcfg.get('INNERTUBE_CONTEXT') : null,
+                    apiKey: window.ytcfg ? ytcfg.get('INNERTUBE_API_KEY') : null
+                })
+            """)
+        except Exception as e:
+            progress_callback(f"Could not read ytInitialData: {str(e)}")
+            return []
+        
+        if not page_data['initialData'] or not page_data['context']:
+            return []
+        
+        progress_callback("Reading video list from page data...")
+        video_links = []
+        seen = set() # Video IDs, checked as each page of results arrives
+        tokens = []
+        self.collect_initial_data_videos(page_data['initialData'], video_links, seen, tokens)
+        
+        browse_url = "https://www.youtube.com/youtubei/v1/browse?prettyPrint=false"
+        if page_data['apiKey']:
+            browse_url += f"&key={page_data['apiKey']}"
+        
+        requests_made = 0
+        used_tokens = set()
+        while tokens:
+            token = tokens[-1]
+            if token in used_tokens:
+                progress_callback("Continuation token repeated, stopping.")
+                break
+            if requests_made >= max_requests: # Safety break for massive channels
+                progress_callback(f"Reached {max_requests} continuation requests, stopping.")
+                break
+            used_tokens.add(token)
+            
+            try:
+                # page.request shares the context's cookies
+                response = await page.request.post(browse_url, data={
+                    'context': page_data['context'],
+                    'continuation': token
+                })
+                if not response.ok:
+                    progress_callback(f"Continuation request failed (HTTP {response.status}), stopping.")
+                    break
+                continuation_data = await response.json()
+            except Exception as e:
+                progress_callback(f"Continuation request failed ({str(e)}), stopping.")
+                break
+            
+            tokens = []
+            self.collect_initial_data_videos(continuation_data, video_links, seen, tokens)
+            requests_made += 1
+            progress_callback(f"Continuation {requests_made}: {len(video_links)} videos so far")
+        
+        return video_links
+    
+    async def scroll_and_extract_links(self, page, progress_callback):
+        """Scroll the page until no new videos load, then read the links from the DOM"""
+        progress_callback("Scrolling to load all videos (this may take a while)...")
+
+        # --- START: IMPROVED SCROLLING LOGIC ---
+        # The whole scroll-until-stable loop runs inside the page so it
+        # costs one round trip; the page reports progress back via report().
+        max_patience = 5 # Stop after 5 consecutive scrolls with no new content
+        max_scrolls = 200 # Safety break for massive channels
+
+        def report(attempt, height, patience):
+            if patience:
+                progress_callback(f"Scroll {attempt}: No new content... (Patience {patience}/{max_patience})")
+            else:
+                progress_callback(f"Scroll {attempt}: Loaded new videos. (Height: {height})")
+
+        await page.expose_function("report", report)
+
+        scroll_attempts = await page.evaluate("""
+            async ({ maxPatience, maxScrolls }) => {
+                // Resolves as soon as new content grows the page, or after the timeout
+                const waitForGrowth = async (lastHeight, timeout) => {
+                    const start = Date.now();
+                    while (Date.now() - start < timeout) {
+                        await new Promise(r => setTimeout(r, 100));
+                        if (document.documentElement.scrollHeight !== lastHeight) return;
+                    }
+                };
+
+                let previousHeight = -1;
+                let patience = 0;
+                let attempts = 0;
+
+                while (patience < maxPatience && attempts <= maxScrolls) {
+                    const lastHeight = document.documentElement.scrollHeight;
+                    window.scrollTo(0, lastHeight);
+                    await waitForGrowth(lastHeight, 4000);
+
+                    const height = document.documentElement.scrollHeight;
+                    if (height === previousHeight) {
+                        patience++;
+                    } else {
+                        patience = 0;
+                        previousHeight = height;
+                    }
+                    window.report(attempts, height, patience);
+                    attempts++;
+                }
+                return attempts;
+            }
+        """, {"maxPatience": max_patience, "maxScrolls": max_scrolls})
+
+        if scroll_attempts > max_scrolls:
+            progress_callback(f"Reached {max_scrolls} scroll attempts, stopping.")
+
+        progress_callback(f"Scrolling complete after {scroll_attempts} attempts.")
+        # --- END: IMPROVED SCROLLING LOGIC ---
+
+        await asyncio.sleep(3)
+
+        progress_callback("Extracting video links...")
+
+        video_links = await page.evaluate("""
+            () => {
+                const links = [];
+                const seen = new Set();
+                // One union selector walks the DOM once instead of once per selector
+                const elements = document.querySelectorAll([
+                    'a#video-title', 'a#video-title-link',
+                    'a.yt-simple-endpoint.style-scope.ytd-video-renderer',
+                    'ytd-video-renderer a#video-title',
+                    'ytd-grid-video-renderer a#video-title',
+                    'ytd-playlist-video-renderer a#video-title'
+                ].join(', '));
+
+                // Clean and dedupe here so only unique, titled videos cross to Python
+                for (const el of elements) {
+                    if (!el.href || !el.href.includes('watch?v=')) continue;
+                    const url = el.href.split('&')[0];
+                    const title = el.title || el.textContent.trim();
+                    if (title && !seen.has(url)) {
+                        seen.add(url);
+                        links.push({ url, title });
+                    }
+                }
+                return links;
+            }
+        """)
         
+        return video_links
+    
+    async def get_transcript(self, video_url, video_title, page, progress_callback):
+        """Get transcript for a single video using an already-open page"""
         try:
             # Shorten video title for logging
             log_title = (video_title[:50] + '...') if len(video_title) > 50 else video_title
@@ -166,7 +419,8 @@ class YouTubeTranscriptExtractor:
                 except:
                     video_title = "Unknown Video"
             
-            await page.wait_for_selector('video', timeout=20000)
+            # Media is blocked, so wait for the metadata panel rather than the <video> element
+            await page.wait_for_selector('ytd-watch-metadata', timeout=20000)
             
             transcript_opened = False
             
@@ -223,8 +477,6 @@ class YouTubeTranscriptExtractor:
         except Exception as e:
             progress_callback(f"  [ERROR] {log_title}: {str(e)}")
             return None
-        finally:
-            await context.close()
     
     def format_transcript(self, segments):
         """Format transcript segments into readable paragraphs"""
@@ -234,142 +486,275 @@ class YouTubeTranscriptExtractor:
         text = " ".join(seg['text'] for seg in segments if seg['text'])
         text = text.replace('  ', ' ').strip()
         
-        sentences = []
-        current = ""
-        
-        for char in text:
-            current += char
-            if char in '.!?' and len(current) > 20:
-                sentences.append(current.strip())
-                current = ""
-        if current:
-            sentences.append(current.strip())
-        
-        paragraphs = []
-        current_para = []
-        for i, sentence in enumerate(sentences):
-            current_para.append(sentence)
-            if len(current_para) >= 4 or i == len(sentences) - 1:
-                paragraphs.append(" ".join(current_para))
-                current_para = []
+        # Matches are back to back, so whatever follows the last one is the tail
+        matches = SENTENCE_RE.findall(text)
+        tail = text[sum(map(len, matches)):]
+        sentences = [m.strip() for m in matches]
+        if tail:
+            sentences.append(tail.strip())
+        
+        paragraphs = [" ".join(sentences[i:i + 4]) for i in range(0, len(sentences), 4)]
         
         return "\n\n".join(paragraphs)
 
-    async def worker(self, video, browser, semaphore, progress_callback):
+    async def worker(self, video, pool, progress_callback):
         """
-        A worker that acquires a semaphore, gets a transcript,
-        and saves the files.
+        A worker that borrows a page from the pool to get a transcript,
+        then saves the files.
         """
-        async with semaphore:
-            # Call get_transcript
-            result = await self.get_transcript(video['url'], video['title'], browser, progress_callback)
+        # The page goes back to the pool as soon as the transcript is read,
+        # so the next video can start while this one is formatted and saved
+        async with pool.acquire() as page:
+            result = await self.get_transcript(video['url'], video['title'], page, progress_callback)
+        
+        # get_transcript now returns (transcript_segments, actual_title) or None
+        if result:
+            transcript, actual_title = result
             
-            # get_transcript now returns (transcript_segments, actual_title) or None
-            if result:
-                transcript, actual_title = result
-                
-                # Use the *actual* title from the page if we found it
-                video['title'] = actual_title 
-                
-                # --- Save file logic (moved from process_url) ---
-                safe_title = re.sub(r'[^\w\s-]', '', video['title'])[:100].strip()
-                if not safe_title or safe_title == "Unknown Video":
-                    safe_title = video['url'].split('watch?v=')[-1]
-
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                filename = f"{safe_title}_{timestamp}.txt"
-                filepath = self.output_dir / filename
-                
-                formatted_text = self.format_transcript(transcript)
-                
-                with open(filepath, 'w', encoding='utf-8') as f:
-                    f.write(f"Video: {video['title']}\n")
-                    f.write(f"URL: {video['url']}\n")
-                    f.write(f"Downloaded: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                    f.write("="*80 + "\n\n")
-                    f.write(formatted_text)
-                
-                # Save raw version
-                raw_filename = f"{safe_title}_{timestamp}_raw.txt"
-                raw_filepath = self.output_dir / raw_filename
-                
-                with open(raw_filepath, 'w', encoding='utf-8') as f:
-                    f.write(f"Video: {video['title']}\n")
-                    f.write(f"URL: {video['url']}\n")
-                    f.write(f"Downloaded: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                    f.write("="*80 + "\n\n")
-                    
-                    for segment in transcript:
-                        if segment['text']:
-                            timestamp_str = f"[{segment['timestamp']}] " if segment['timestamp'] else ""
-                            f.write(f"{timestamp_str}{segment['text']}\n")
-                
-                progress_callback(f"  [SAVED] {filename}")
-                return {'video': video['title'], 'status': 'Success', 'file': filename}
-            else:
-                # get_transcript already logged the failure
-                return {'video': video['title'], 'status': 'No transcript available'}
+            # Use the *actual* title from the page if we found it
+            video['title'] = actual_title 
+            
+            # --- Save file logic (moved from process_url) ---
+            safe_title = UNSAFE_FILENAME_RE.sub('', video['title'])[:100].strip()
+            if not safe_title or safe_title == "Unknown Video":
+                safe_title = video['url'].split('watch?v=')[-1]
 
-    async def process_url(self, url, progress_callback):
-        """Main processing function"""
+            # One clock reading so the filename and header timestamps always match
+            now = datetime.now()
+            timestamp = now.strftime("%Y%m%d_%H%M%S")
+            filename = f"{safe_title}_{timestamp}.txt"
+            filepath = self.output_dir / filename
+            
+            # Each file is built in memory and written with a single call
+            header = (
+                f"Video: {video['title']}\n"
+                f"URL: {video['url']}\n"
+                f"Downloaded: {now.isoformat(sep=' ', timespec='seconds')}\n"
+                + "="*80 + "\n\n"
+            )
+            
+            formatted_text = self.format_transcript(transcript)
+            
+            # Raw version keeps one timestamped line per segment
+            raw_filename = f"{safe_title}_{timestamp}_raw.txt"
+            raw_filepath = self.output_dir / raw_filename
+            
+            raw_lines = [
+                f"[{segment['timestamp']}] {segment['text']}" if segment['timestamp'] else segment['text']
+                for segment in transcript if segment['text']
+            ]
+            raw_text = "".join(line + "\n" for line in raw_lines)
+            
+            # Disk writes run in a thread so other workers keep scraping meanwhile
+            # (run_in_executor rather than asyncio.to_thread to keep Python 3.7 support)
+            loop = asyncio.get_running_loop()
+            await asyncio.gather(
+                loop.run_in_executor(None, filepath.write_bytes, (header + formatted_text).encode('utf-8')),
+                loop.run_in_executor(None, raw_filepath.write_bytes, (header + raw_text).encode('utf-8'))
+            )
+            
+            progress_callback(f"  [SAVED] {filename}")
+            return {'video': video['title'], 'status': 'Success', 'file': filename}
+        else:
+            # get_transcript already logged the failure
+            return {'video': video['title'], 'status': 'No transcript available'}
+
+    @asynccontextmanager
+    async def open_browser(self, progress_callback):
+        """Launch Chromium and yield a ContextPool for it"""
         async with async_playwright() as p:
             progress_callback("Launching browser...")
             browser = await p.chromium.launch(
                 headless=True,
-                args=['--no-sandbox', '--disable-setuid-sandbox']
+                # Headless needs none of GPU, canvas acceleration or /dev/shm,
+                # and dropping them cuts memory use per page.
+                args=[
+                    '--no-sandbox', '--disable-setuid-sandbox',
+                    '--disable-gpu', '--disable-accelerated-2d-canvas',
+                    '--disable-dev-shm-usage', '--no-zygote',
+                    '--disable-mipmap-generation'
+                ]
             )
             
             try:
-                if 'watch?v=' in url:
-                    progress_callback("Detected single video URL")
-                    video_id = url.split('watch?v=')[1].split('&')[0]
-                    videos = [{
-                        'url': f'https://www.youtube.com/watch?v={video_id}',
-                        'title': 'Video (title will be extracted)'
-                    }]
-                else:
-                    videos = await self.extract_video_urls(url, browser, progress_callback)
-                
-                if not videos:
-                    progress_callback("No videos found! Please check the URL.")
-                    return
-                
-                progress_callback(f"\n{'='*60}")
-                progress_callback(f"Found {len(videos)} videos. Starting concurrent extraction...")
-                progress_callback(f"Processing {CONCURRENT_DOWNLOADS} videos at a time.")
-                progress_callback(f"{'='*60}\n")
-                
-                # --- Concurrency Logic ---
-                semaphore = asyncio.Semaphore(CONCURRENT_DOWNLOADS)
-                tasks = []
-                
-                for video in videos:
-                    # Create a task for each worker
-                    tasks.append(self.worker(video, browser, semaphore, progress_callback))
-                
-                # Run all tasks concurrently and wait for them to finish
-                all_results = await asyncio.gather(*tasks)
-                # --- End Concurrency Logic ---
-                
-                # Process results
-                successful = 0
-                for result in all_results:
-                    if result and result['status'] == 'Success':
-                        successful += 1
-                
-                # Save summary
-                summary_file = self.output_dir / f"summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-                with open(summary_file, 'w', encoding='utf-8') as f:
-                    json.dump(all_results, f, indent=2, ensure_ascii=False)
-                
-                progress_callback(f"\n{'='*60}")
-                progress_callback(f"Extraction complete!")
-                progress_callback(f"Successful: {successful}/{len(videos)}")
-                progress_callback(f"Output directory: {self.output_dir}")
-                progress_callback(f"{'='*60}")
-                
+                # Contexts are reused and recycled rather than created per video,
+                # which is slow and leaks memory over long runs.
+                yield ContextPool(
+                    browser,
+                    viewport={'width': 1920, 'height': 1080},
+                    user_agent='Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+                    java_script_enabled=True,
+                    bypass_csp=True,
+                    service_workers="block"
+                )
             finally:
                 await browser.close()
+    
+    async def download_videos(self, videos, context_pool, progress_callback):
+        """Download transcripts for a list of videos using an open browser's ContextPool"""
+        pool = PagePool(context_pool, max_size=CONCURRENT_DOWNLOADS)
+        tasks = []
+        
+        for video in videos:
+            # Create a task for each worker
+            tasks.append(self.worker(video, pool, progress_callback))
+        
+        # Run all tasks concurrently and wait for them to finish
+        return await asyncio.gather(*tasks)
+    
+    async def process_shard(self, videos, progress_callback):
+        """Download transcripts for a list of videos in a freshly launched browser"""
+        async with self.open_browser(progress_callback) as context_pool:
+            return await self.download_videos(videos, context_pool, progress_callback)
+    
+    async def process_shards_in_subprocesses(self, videos, shard_count, progress_callback):
+        """
+        Split videos into contiguous shards, download each in its own process
+        and browser, and return the results in the original order.
+        """
+        shard_size = -(-len(videos) // shard_count)
+        shards = [videos[i:i + shard_size] for i in range(0, len(videos), shard_size)]
+        loop = asyncio.get_running_loop()
+        # Forking this multithreaded process (Tk + extraction thread) can deadlock,
+        # so children are spawned fresh
+        mp_context = multiprocessing.get_context("spawn")
+        
+        with mp_context.Manager() as manager, \
+                ProcessPoolExecutor(max_workers=len(shards), mp_context=mp_context) as executor:
+            # Children report progress through this queue; it is relayed below
+            progress_queue = manager.Queue()
+            done = asyncio.gather(*(
+                loop.run_in_executor(executor, run_shard, self, shard, progress_queue)
+                for shard in shards
+            ))
+            
+            while True:
+                while True:
+                    try:
+                        progress_callback(progress_queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if done.done():
+                    break
+                await asyncio.wait([done], timeout=0.1)
+            
+            shard_results = await done
+        
+        return [result for results in shard_results for result in results]
+    
+    async def process_url(self, url, progress_callback):
+        """Main processing function"""
+        # One browser handles enumeration and, unless downloads are sharded
+        # across processes, the downloads too
+        async with self.open_browser(progress_callback) as context_pool:
+            if 'watch?v=' in url:
+                progress_callback("Detected single video URL")
+                video_id = url.split('watch?v=')[1].split('&')[0]
+                videos = [{
+                    'url': f'https://www.youtube.com/watch?v={video_id}',
+                    'title': 'Video (title will be extracted)'
+                }]
+            else:
+                context = await context_pool.acquire()
+                try:
+                    videos = await self.extract_video_urls(url, context, progress_callback)
+                finally:
+                    await context_pool.release(context)
+            
+            if not videos:
+                progress_callback("No videos found! Please check the URL.")
+                return
+            
+            shard_count = min(CONCURRENT_PROCESSES, os.cpu_count() or 1, len(videos))
+            
+            progress_callback(f"\n{'='*60}")
+            progress_callback(f"Found {len(videos)} videos. Starting concurrent extraction...")
+            if shard_count > 1:
+                progress_callback(f"Processing {CONCURRENT_DOWNLOADS} videos at a time in each of {shard_count} processes.")
+            else:
+                progress_callback(f"Processing {CONCURRENT_DOWNLOADS} videos at a time.")
+            progress_callback(f"{'='*60}\n")
+            
+            # --- Concurrency Logic ---
+            if shard_count == 1:
+                all_results = await self.download_videos(videos, context_pool, progress_callback)
+        
+        # Shards launch their own browsers, so this one is closed first
+        if shard_count > 1:
+            all_results = await self.process_shards_in_subprocesses(videos, shard_count, progress_callback)
+        # --- End Concurrency Logic ---
+        
+        # Process results
+        successful = 0
+        for result in all_results:
+            if result and result['status'] == 'Success':
+                successful += 1
+        
+        # Save summary
+        summary_file = self.output_dir / f"summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+        with open(summary_file, 'w', encoding='utf-8') as f:
+            json.dump(all_results, f, indent=2, ensure_ascii=False)
+        
+        progress_callback(f"\n{'='*60}")
+        progress_callback(f"Extraction complete!")
+        progress_callback(f"Successful: {successful}/{len(videos)}")
+        progress_callback(f"Output directory: {self.output_dir}")
+        progress_callback(f"{'='*60}")
+
+
+def run_shard(extractor, videos, progress_queue):
+    """Worker-process entry point: download one shard with its own event loop and browser"""
+    return asyncio.run(extractor.process_shard(videos, progress_queue.put))
+
+
+def transcript_fingerprint(text, sample_size=256):
+    """
+    64-bit SimHash of a transcript's three-word shingles, or None if it has no words.
+    Only the sample_size shingles with the smallest hashes vote, which keeps long
+    transcripts cheap.
+    """
+    words = text.lower().split()
+    if not words:
+        return None
+    
+    # A 128-bit digest per shingle: the high half picks the sample and the
+    # independent low half votes. Voting with the selection hash would leave
+    # the top bits of every fingerprint at 0, since only small hashes are picked.
+    shingle_hashes = (
+        int.from_bytes(hashlib.blake2b(" ".join(words[i:i + 3]).encode('utf-8'), digest_size=16).digest(), 'big')
+        for i in range(max(1, len(words) - 2))
+    )
+    votes = [0] * 64
+    for h in heapq.nsmallest(sample_size, shingle_hashes):
+        for bit in range(64):
+            votes[bit] += 1 if (h >> bit) & 1 else -1
+    return sum(1 << bit for bit in range(64) if votes[bit] > 0)
+
+
+class NearDuplicateIndex:
+    """Finds fingerprints within NEAR_DUPLICATE_BITS of one already added"""
+    def __init__(self, max_distance=NEAR_DUPLICATE_BITS):
+        # Two fingerprints that differ in at most max_distance bits must agree
+        # exactly on at least one of max_distance + 1 bands, so only
+        # fingerprints sharing a band ever need a full comparison.
+        self.max_distance = max_distance
+        self.band_bits = 64 // (max_distance + 1)
+        self.bands = {}
+    
+    def _band_keys(self, fingerprint):
+        mask = (1 << self.band_bits) - 1
+        return [(i, (fingerprint >> (i * self.band_bits)) & mask) for i in range(self.max_distance + 1)]
+    
+    def add(self, fingerprint):
+        """Add a fingerprint; returns True if a near-duplicate was already present"""
+        keys = self._band_keys(fingerprint)
+        for key in keys:
+            for other in self.bands.get(key, ()):
+                if bin(fingerprint ^ other).count('1') <= self.max_distance:
+                    return True
+        for key in keys:
+            self.bands.setdefault(key, []).append(fingerprint)
+        return False
 
 
 class TranscriptExtractorGUI:
@@ -380,8 +765,10 @@ class TranscriptExtractorGUI:
         
         self.extractor = YouTubeTranscriptExtractor()
         self.is_running = False
+        self.log_queue = queue.Queue()
         
         self.setup_ui()
+        self.root.after(LOG_DRAIN_INTERVAL_MS, self._drain_log_queue)
     
     def setup_ui(self):
         # URL input
@@ -482,22 +869,25 @@ class TranscriptExtractorGUI:
 
         # 3. Read and merge files
         try:
-            with open(save_path, 'w', encoding='utf-8') as merged_file:
-                merged_file.write(f"MERGED TRANSCRIPTS (Selected Files)\n")
-                merged_file.write(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                merged_file.write(f"Total files: {len(file_paths)}\n")
-                merged_file.write("="*80 + "\n\n")
+            # Files are copied as raw bytes, so nothing is decoded or held in memory
+            with open(save_path, 'wb') as merged_file:
+                merged_file.write((
+                    f"MERGED TRANSCRIPTS (Selected Files)\n"
+                    f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+                    f"Total files: {len(file_paths)}\n"
+                    + "="*80 + "\n\n"
+                ).encode('utf-8'))
+                separator = ("\n\n" + "="*80 + "\n\n").encode('utf-8')
 
                 for idx, file_path_str in enumerate(file_paths):
                     file_path = Path(file_path_str)
                     
                     if file_path.exists():
-                        with open(file_path, 'r', encoding='utf-8') as infile:
-                            content = infile.read()
-                            merged_file.write(content)
+                        with open(file_path, 'rb') as infile:
+                            shutil.copyfileobj(infile, merged_file, length=1 << 20)
                             
                             if idx < len(file_paths) - 1:
-                                merged_file.write("\n\n" + "="*80 + "\n\n")
+                                merged_file.write(separator)
                     else:
                         self.log_progress(f"  [WARNING] File not found, skipping: {file_path.name}")
             
@@ -545,52 +935,88 @@ class TranscriptExtractorGUI:
             self.log_progress("Merge (All) save cancelled by user.")
             return
 
-        # 3. Read and merge files
+        # 3. Read and merge files in a separate thread; fingerprinting
+        # thousands of transcripts would otherwise freeze the GUI
+        self.merge_all_button.config(state='disabled')
+        thread = threading.Thread(target=self.run_merge_all, args=(transcript_files, save_path, output_dir))
+        thread.daemon = True
+        thread.start()
+
+    def run_merge_all(self, transcript_files, save_path, output_dir):
+        """
+        Skips near-duplicates and writes the merged file. This runs in a
+        separate thread, so GUI calls go through after().
+        """
         try:
-            with open(save_path, 'w', encoding='utf-8') as merged_file:
-                merged_file.write(f"MERGED TRANSCRIPTS (All Files)\n")
-                merged_file.write(f"Source Folder: {output_dir}\n")
-                merged_file.write(f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-                merged_file.write(f"Total files: {len(transcript_files)}\n")
-                merged_file.write("="*80 + "\n\n")
+            # Skip near-duplicates (e.g. the same video downloaded twice).
+            # The header is left out since its date and URL always differ.
+            index = NearDuplicateIndex()
+            unique_files = []
+            for file_path in transcript_files:
+                text = file_path.read_text(encoding='utf-8', errors='replace')
+                fingerprint = transcript_fingerprint(text.split("="*80, 1)[-1])
+                if fingerprint is not None and index.add(fingerprint):
+                    self.log_progress(f"  [DUPLICATE] Skipping {file_path.name}")
+                else:
+                    unique_files.append(file_path)
+            
+            skipped = len(transcript_files) - len(unique_files)
+            if skipped:
+                self.log_progress(f"Skipped {skipped} near-duplicate transcripts.")
+            transcript_files = unique_files
+            
+            # The kept files are copied as raw bytes, without decoding them again
+            with open(save_path, 'wb') as merged_file:
+                merged_file.write((
+                    f"MERGED TRANSCRIPTS (All Files)\n"
+                    f"Source Folder: {output_dir}\n"
+                    f"Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+                    f"Total files: {len(transcript_files)}\n"
+                    + "="*80 + "\n\n"
+                ).encode('utf-8'))
+                separator = ("\n\n" + "="*80 + "\n\n").encode('utf-8')
 
                 for idx, file_path in enumerate(transcript_files):
-                    with open(file_path, 'r', encoding='utf-8') as infile:
-                        content = infile.read()
-                        merged_file.write(content)
+                    with open(file_path, 'rb') as infile:
+                        shutil.copyfileobj(infile, merged_file, length=1 << 20)
                         
                         if idx < len(transcript_files) - 1:
-                            merged_file.write("\n\n" + "="*80 + "\n\n")
+                            merged_file.write(separator)
             
             self.log_progress(f"Successfully merged {len(transcript_files)} transcripts to {save_path}")
-            messagebox.showinfo("Success", f"Merged {len(transcript_files)} transcripts to {save_path}")
+            self.root.after(0, messagebox.showinfo, "Success", f"Merged {len(transcript_files)} transcripts to {save_path}")
 
         except Exception as e:
             self.log_progress(f"  [ERROR] Failed to merge: {e}")
-            messagebox.showerror("Error", f"An error occurred during merging: {e}")
+            self.root.after(0, messagebox.showerror, "Error", f"An error occurred during merging: {e}")
+        finally:
+            self.root.after(0, self.merge_all_button.config, {'state': 'normal'})
     # --- END NEW ---
 
     def log_progress(self, message):
         """Log messages in a thread-safe way"""
-        try:
-            if not self.root.winfo_exists():
-                 return
-            
-            # Use after() to schedule the update on the main thread
-            self.root.after(0, self._update_log_text, message)
-        except tk.TclError:
-            pass # Ignore errors if window is closing
+        # Messages are queued and written to the widget in batches by
+        # _drain_log_queue, so a busy extraction doesn't flood Tk with callbacks
+        self.log_queue.put(message)
 
-    def _update_log_text(self, message):
-        """Internal method to update the GUI, runs on main thread"""
+    def _drain_log_queue(self):
+        """Internal method to update the GUI, runs on main thread every LOG_DRAIN_INTERVAL_MS"""
+        batch = []
+        try:
+            while len(batch) < LOG_DRAIN_BATCH_SIZE:
+                batch.append(self.log_queue.get_nowait())
+        except queue.Empty:
+            pass
+        
         try:
-            self.progress_text.config(state='normal')
-            self.progress_text.insert(tk.END, message + "\n")
-            self.progress_text.see(tk.END)
-            self.progress_text.config(state='disabled')
-            # No root.update() needed here, after() handles it
+            if batch:
+                self.progress_text.config(state='normal')
+                self.progress_text.insert(tk.END, "\n".join(batch) + "\n")
+                self.progress_text.see(tk.END)
+                self.progress_text.config(state='disabled')
+            self.root.after(LOG_DRAIN_INTERVAL_MS, self._drain_log_queue)
         except tk.TclError:
-            pass # Ignore if widget is destroyed
+            pass # Window is closing, stop draining
 
     def clear_log(self):
         self.progress_text.config(state='normal')
@@ -638,10 +1064,22 @@ class TranscriptExtractorGUI:
             self.root.after(0, self.start_button.config, {'state': 'normal'})
     
     def open_output_folder(self):
-        os.system(f'xdg-open "{self.extractor.output_dir}"')
+        # Launched directly (no shell), so any characters in the path are safe
+        try:
+            subprocess.Popen(
+                ["xdg-open", str(self.extractor.output_dir)],
+                stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                start_new_session=True
+            )
+        except OSError as e:
+            # e.g. xdg-open is not installed (Windows, minimal Linux installs)
+            self.log_progress(f"  [ERROR] Could not open output folder: {e}")
+            messagebox.showerror("Error", f"Could not open the output folder: {e}\n\nIt is located at: {self.extractor.output_dir}")
 
 
 def main():
+    # Give the Playwright driver (a Node.js process) more heap on long runs
+    os.environ.setdefault("NODE_OPTIONS", "--max-old-space-size=8192")
     root = tk.Tk()
     app = TranscriptExtractorGUI(root)
     root.mainloop()